@@ -24,6 +24,8 @@ import struct
 import math
 import argparse
 import json
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from typing import List, Dict, Tuple, Optional, Any
 from dataclasses import dataclass
 from pathlib import Path
@@ -35,6 +37,14 @@ except ImportError:
     NUMPY_AVAILABLE = False
     # Numpy is optional for basic functionality
 
+# Check for orjson availability
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    # orjson is optional; the standard json module is used instead
+
 # Check for Blender availability
 try:
     import bpy
@@ -139,9 +149,100 @@ MDL_ANORMS = [
     (-0.587785, -0.425325, -0.688191), (-0.688191, -0.587785, -0.425325)
 ]
 
+# Fixed-width MDL record layouts
+_HEADER_S = struct.Struct('<4sI64sI3f3f5I')  # magic, version, name, name length, bounds, counts
+_VERTEX_S = struct.Struct('<BBBB')  # x, y, z, normal index
+_TRIANGLE_S = struct.Struct('<IIII')  # face front, 3 vertex indices
+_BONE_S = struct.Struct('<32siI3f3f')  # name, parent, flags, position, rotation
+_SEQUENCE_S = struct.Struct('<32sf10I3fII3f3f')
+_TEXTURE_S = struct.Struct('<64sIIII')  # name, flags, width, height, index
+
+# Octant -> candidate anorms for the pure-Python normal search, indexed by
+# (nx >= 0) << 2 | (ny >= 0) << 1 | (nz >= 0). Every unit vector is within
+# ~10.8 degrees (chord 0.19) of its nearest anorm, so the winner can sit at
+# most that far across the octant's planes; 0.25 leaves slack. Lists keep
+# ascending index order so ties resolve exactly like a full search.
+_OCTANT_MARGIN = 0.25
+_OCTANT_CANDIDATES = [
+    tuple((i, *anorm) for i, anorm in enumerate(MDL_ANORMS)
+          if all(anorm[axis] * (1 if octant & (4 >> axis) else -1) >= -_OCTANT_MARGIN
+                 for axis in range(3)))
+    for octant in range(8)
+]
+
+# Anorm table as a (162, 3) matrix for vectorized normal lookups, plus a
+# C-contiguous (3, 162) transpose so scoring is a plain row-major matmul.
+# Both are shared module globals, so they are made read-only.
+if NUMPY_AVAILABLE:
+    ANORMS_NP = np.ascontiguousarray(MDL_ANORMS, dtype=np.float32)
+    ANORMS_NP_T = np.ascontiguousarray(ANORMS_NP.T)
+    ANORMS_NP.flags.writeable = False
+    ANORMS_NP_T.flags.writeable = False
+
+# QC file template for StudioMDL
+_QC_TEMPLATE = '''/*
+==============================================================================
+
+\tMODEL: {model_name}
+\tGenerated by FBX to MDL Converter
+
+==============================================================================
+*/
+
+$modelname "{mdl_name}"
+$cd "./"
+$cdtexture "./"
+$scale 1.0
+
+{textures}
+$body "Body" "{model_name}"
+
+{sequences}
+$collisionmodel "{model_name}_collision" {{
+\t$mass 1.0
+\t$inertia 1.0
+\t$damping 0.0
+\t$rotdamping 0.0
+}}
+'''
+
+# Forsyth vertex cache optimizer tuning (values from the original paper)
+_VCACHE_SIZE = 32
+_VCACHE_DECAY_POWER = 1.5
+_VCACHE_LAST_TRI_SCORE = 0.75
+_VCACHE_VALENCE_BOOST_SCALE = 2.0
+_VCACHE_VALENCE_BOOST_POWER = 0.5
+
+# Rows of normals scored per matmul block in the numpy batch path
+NORMAL_BLOCK_ROWS = 1024
+
+def _transform_mesh(coords: "np.ndarray", normals: "np.ndarray",
+                    matrix: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """Transform (N, 3) local positions and normals by a 4x4 world matrix"""
+    world_coords = coords @ matrix[:3, :3].T + matrix[:3, 3]
+    
+    # Normals transform by the inverse-transpose
+    # (pinv keeps degenerate zero-scale objects from raising)
+    world_normals = normals @ np.linalg.pinv(matrix[:3, :3])
+    world_normals /= np.linalg.norm(world_normals, axis=1, keepdims=True).clip(1e-8)
+    return world_coords, world_normals
+
+def _merge_duplicate_vertices(coords: "np.ndarray", normals: "np.ndarray",
+                              faces: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Merge identical vertices and remap (M, 3) face indices onto the unique rows"""
+    # Position and normal are matched together so hard edges keep their split normals
+    unique_rows, inverse = np.unique(np.hstack([coords, normals]), axis=0, return_inverse=True)
+    return unique_rows[:, :3], unique_rows[:, 3:], inverse.reshape(-1)[faces]
+
+def _encode_name(name: str, width: int) -> bytes:
+    """Encode a name as a null-padded fixed-width ASCII field"""
+    return name.encode('ascii', 'replace')[:width].ljust(width, b'\0')
+
 @dataclass
 class MDLVertex:
     """MDL vertex structure"""
+    __slots__ = ('x', 'y', 'z', 'normal_index')  # No per-instance __dict__
+    
     x: int  # 0-255 range
     y: int  # 0-255 range  
     z: int  # 0-255 range
@@ -150,21 +251,35 @@ class MDLVertex:
 @dataclass
 class MDLTriangle:
     """MDL triangle structure"""
+    __slots__ = ('face_front', 'vertex_indices')  # No per-instance __dict__
+    
     face_front: bool
     vertex_indices: List[int]  # 3 vertex indices
 
 @dataclass
 class MDLBone:
     """MDL bone structure"""
+    __slots__ = ('name', 'parent', 'flags', 'position', 'rotation')  # No per-instance __dict__
+    
     name: str
     parent: int  # Parent bone index (-1 for root)
     flags: int
     position: Tuple[float, float, float]
     rotation: Tuple[float, float, float]
+    
+    @property
+    def name_bytes(self) -> bytes:
+        """Name as the fixed-width field written to the MDL file"""
+        return _encode_name(self.name, 32)
 
 @dataclass
 class MDLSequence:
     """MDL animation sequence"""
+    # No per-instance __dict__
+    __slots__ = ('name', 'fps', 'flags', 'activity', 'actweight', 'numevents', 'eventindex',
+                 'numframes', 'numblends', 'animindex', 'motiontype', 'motionbone',
+                 'linearmovement', 'automoveposindex', 'automoveangleindex', 'bbmin', 'bbmax')
+    
     name: str
     fps: float
     flags: int
@@ -182,15 +297,27 @@ class MDLSequence:
     automoveangleindex: int
     bbmin: Tuple[float, float, float]
     bbmax: Tuple[float, float, float]
+    
+    @property
+    def name_bytes(self) -> bytes:
+        """Name as the fixed-width field written to the MDL file"""
+        return _encode_name(self.name, 32)
 
 @dataclass
 class MDLTexture:
     """MDL texture structure"""
+    __slots__ = ('name', 'flags', 'width', 'height', 'index')  # No per-instance __dict__
+    
     name: str
     flags: int
     width: int
     height: int
     index: int
+    
+    @property
+    def name_bytes(self) -> bytes:
+        """Name as the fixed-width field written to the MDL file"""
+        return _encode_name(self.name, 64)
 
 class FBXToMDLConverter:
     """Main converter class"""
@@ -205,21 +332,63 @@ class FBXToMDLConverter:
         self.bounds_min = [0.0, 0.0, 0.0]
         self.bounds_max = [0.0, 0.0, 0.0]
         
+        # Packed mesh data (structure of arrays) filled by the FBX loader.
+        # When set, these take precedence over the vertices/triangles lists.
+        self.vertices_xyz: Optional["np.ndarray"] = None    # (N, 3) uint8
+        self.vertex_normals: Optional["np.ndarray"] = None  # (N,) uint8 anorm indices
+        self.tri_indices: Optional["np.ndarray"] = None     # (T, 3) uint32
+        self.tri_front: Optional["np.ndarray"] = None       # (T,) uint8
+    
+    @property
+    def vertex_count(self) -> int:
+        """Number of vertices in the model"""
+        if self.vertices_xyz is not None:
+            return len(self.vertices_xyz)
+        return len(self.vertices)
+    
+    @property
+    def triangle_count(self) -> int:
+        """Number of triangles in the model"""
+        if self.tri_indices is not None:
+            return len(self.tri_indices)
+        return len(self.triangles)
+    
     def find_closest_normal(self, normal: Tuple[float, float, float]) -> int:
         """Find the closest MDL anorm index for a given normal vector"""
+        if NUMPY_AVAILABLE:
+            return int(np.argmax(np.asarray(normal, dtype=np.float32) @ ANORMS_NP_T))
+        
+        # Only score the anorms that can win for this normal's octant
+        nx, ny, nz = normal[0], normal[1], normal[2]
+        if nx == 0 and ny == 0 and nz == 0:
+            return 0  # Every anorm ties; match the full scan's first index
+        candidates = _OCTANT_CANDIDATES[(nx >= 0) << 2 | (ny >= 0) << 1 | (nz >= 0)]
+        
         best_dot = -2.0
         best_index = 0
         
-        for i, anorm in enumerate(MDL_ANORMS):
-            dot = (normal[0] * anorm[0] + 
-                   normal[1] * anorm[1] + 
-                   normal[2] * anorm[2])
+        for i, ax, ay, az in candidates:
+            dot = nx * ax + ny * ay + nz * az
             if dot > best_dot:
                 best_dot = dot
                 best_index = i
                 
         return best_index
     
+    def find_closest_normals_batch(self, normals: "np.ndarray") -> "np.ndarray":
+        """Find the closest MDL anorm index for each row of an (N, 3) normal array"""
+        normals = np.asarray(normals, dtype=np.float32).reshape(-1, 3)
+        # Score in row blocks so the (rows, 162) score matrix stays cache-resident
+        # instead of streaming an (N, 162) float32 matrix through memory
+        indices = np.empty(len(normals), dtype=np.uint8)
+        scores = np.empty((min(len(normals), NORMAL_BLOCK_ROWS), len(ANORMS_NP)), dtype=np.float32)
+        for start in range(0, len(normals), NORMAL_BLOCK_ROWS):
+            block = normals[start:start + NORMAL_BLOCK_ROWS]
+            block_scores = scores[:len(block)]
+            np.matmul(block, ANORMS_NP_T, out=block_scores)
+            indices[start:start + len(block)] = block_scores.argmax(axis=1)
+        return indices
+    
     def compress_vertex(self, vertex: Tuple[float, float, float], 
                        bounds_min: Tuple[float, float, float],
                        bounds_max: Tuple[float, float, float]) -> Tuple[int, int, int]:
@@ -246,15 +415,41 @@ class FBXToMDLConverter:
         
         return (max(0, min(255, x)), max(0, min(255, y)), max(0, min(255, z)))
     
+    def compress_vertices(self, vertices: "np.ndarray",
+                          bounds_min: Tuple[float, float, float],
+                          bounds_max: Tuple[float, float, float]) -> "np.ndarray":
+        """Compress an (N, 3) vertex array to 0-255 range in one pass"""
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+        bmin = np.asarray(bounds_min, dtype=np.float64)
+        rng = np.asarray(bounds_max, dtype=np.float64) - bmin
+        
+        # Handle zero bounds gracefully
+        zero_axes = rng == 0
+        rng_safe = np.where(zero_axes, 1.0, rng)
+        
+        compressed = np.clip((vertices - bmin) / rng_safe * 255.0, 0, 255).astype(np.uint8)
+        compressed[:, zero_axes] = 127  # Center value for zero range
+        return compressed
+    
     def load_fbx_with_blender(self, fbx_path: str) -> bool:
         """Load FBX file using Blender's bpy module"""
         if not BLENDER_AVAILABLE:
             print("Error: Blender's bpy module is not available")
             return False
+        
+        if not NUMPY_AVAILABLE:
+            # Blender bundles numpy, so this only happens with unusual builds
+            print("Error: numpy is required to process FBX meshes")
+            return False
             
         try:
-            # Clear existing mesh data
-            bpy.ops.wm.read_factory_settings(use_empty=True)
+            # Clear existing scene data. Removing the data-blocks directly is much
+            # cheaper than read_factory_settings, which reinitialises UI and addons.
+            for collection in (bpy.data.objects, bpy.data.meshes, bpy.data.armatures,
+                               bpy.data.actions, bpy.data.materials, bpy.data.images,
+                               bpy.data.cameras, bpy.data.lights):
+                for item in list(collection):
+                    collection.remove(item, do_unlink=True)
             
             # Import FBX
             bpy.ops.import_scene.fbx(filepath=fbx_path)
@@ -266,77 +461,75 @@ class FBXToMDLConverter:
                 print("Error: No mesh objects found in FBX file")
                 return False
             
-            # Process meshes
-            all_vertices = []
-            all_faces = []
+            # Process meshes. bpy access stays on this thread; only the raw
+            # buffers are handed to workers for the numpy transform work.
+            coord_arrays = []
+            raw_normal_arrays = []
+            matrices = []
+            face_arrays = []
             vertex_offset = 0
             
             for obj in mesh_objects:
                 mesh = obj.data
+                num_vertices = len(mesh.vertices)
                 
-                # Get vertex data
-                for vertex in mesh.vertices:
-                    world_co = obj.matrix_world @ vertex.co
-                    all_vertices.append((world_co.x, world_co.y, world_co.z))
+                # Get vertex positions and normals in bulk
+                coords = np.empty(num_vertices * 3, dtype=np.float32)
+                mesh.vertices.foreach_get('co', coords)
+                coord_arrays.append(coords.reshape(-1, 3))
                 
-                # Get face data
-                for face in mesh.polygons:
-                    if len(face.vertices) == 3:
-                        # Triangle face
-                        triangle_indices = [v + vertex_offset for v in face.vertices]
-                        all_faces.append(triangle_indices)
-                    elif len(face.vertices) == 4:
-                        # Quad face - split into two triangles
-                        v = [face.vertices[i] + vertex_offset for i in range(4)]
-                        all_faces.append([v[0], v[1], v[2]])
-                        all_faces.append([v[0], v[2], v[3]])
+                normals = np.empty(num_vertices * 3, dtype=np.float32)
+                mesh.vertices.foreach_get('normal', normals)
+                raw_normal_arrays.append(normals.reshape(-1, 3))
                 
-                vertex_offset += len(mesh.vertices)
-            
-            # Calculate bounds
-            if all_vertices:
-                xs, ys, zs = zip(*all_vertices)
-                self.bounds_min = [min(xs), min(ys), min(zs)]
-                self.bounds_max = [max(xs), max(ys), max(zs)]
-            
-            # Convert vertices to MDL format
-            for i, vertex_pos in enumerate(all_vertices):
-                compressed = self.compress_vertex(vertex_pos, self.bounds_min, self.bounds_max)
+                matrices.append(np.asarray(obj.matrix_world, dtype=np.float32))
                 
-                # Calculate normal (simplified - using face normals average)
-                normal = (0.0, 0.0, 1.0)  # Default up normal
-                normal_index = self.find_closest_normal(normal)
+                # Get face data - Blender triangulates quads and n-gons for us
+                mesh.calc_loop_triangles()
+                tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+                mesh.loop_triangles.foreach_get('vertices', tris)
+                face_arrays.append(tris.reshape(-1, 3) + vertex_offset)
                 
-                mdl_vertex = MDLVertex(
-                    x=compressed[0],
-                    y=compressed[1], 
-                    z=compressed[2],
-                    normal_index=normal_index
-                )
-                self.vertices.append(mdl_vertex)
+                vertex_offset += num_vertices
+            
+            # Transform every mesh to world space, in parallel when there are several
+            if len(mesh_objects) > 1:
+                workers = min(len(mesh_objects), os.cpu_count() or 1)
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    transformed = list(pool.map(_transform_mesh, coord_arrays, raw_normal_arrays, matrices))
+            else:
+                transformed = list(map(_transform_mesh, coord_arrays, raw_normal_arrays, matrices))
+            
+            V = np.concatenate([world_coords for world_coords, _ in transformed])
+            N = np.concatenate([world_normals for _, world_normals in transformed])
+            all_faces = np.concatenate(face_arrays)
+            
+            # Merge vertices duplicated within or across submeshes
+            V, N, all_faces = _merge_duplicate_vertices(V, N, all_faces)
+            
+            # Calculate bounds
+            if len(V):
+                self.bounds_min = V.min(axis=0).tolist()
+                self.bounds_max = V.max(axis=0).tolist()
+            
+            # Compress all vertices in one pass
+            self.vertices_xyz = self.compress_vertices(V, self.bounds_min, self.bounds_max)
+            
+            # Map normals to anorm indices in one pass
+            self.vertex_normals = self.find_closest_normals_batch(N)
             
             # Convert faces to triangles
-            for face_indices in all_faces:
-                triangle = MDLTriangle(
-                    face_front=True,
-                    vertex_indices=face_indices
-                )
-                self.triangles.append(triangle)
+            self.tri_indices = all_faces.astype(np.uint32)
+            self.tri_front = np.ones(len(self.tri_indices), dtype=np.uint8)
             
             # Process bones (armature)
             armatures = [obj for obj in bpy.context.scene.objects if obj.type == 'ARMATURE']
             if armatures:
                 armature = armatures[0]
-                bone_index = 0
+                bone_indices: Dict[str, int] = {}  # Blender bone name -> MDL bone index
                 
                 for bone in armature.data.bones:
-                    parent_index = -1
-                    if bone.parent:
-                        # Find parent index
-                        for i, existing_bone in enumerate(self.bones):
-                            if existing_bone.name == bone.parent.name:
-                                parent_index = i
-                                break
+                    parent_index = bone_indices.get(bone.parent.name, -1) if bone.parent else -1
                     
                     mdl_bone = MDLBone(
                         name=bone.name[:32],  # Limit name length
@@ -345,8 +538,8 @@ class FBXToMDLConverter:
                         position=(bone.head_local.x, bone.head_local.y, bone.head_local.z),
                         rotation=(0.0, 0.0, 0.0)  # Simplified
                     )
+                    bone_indices[bone.name] = len(self.bones)
                     self.bones.append(mdl_bone)
-                    bone_index += 1
             
             # Process animations
             if bpy.context.scene.animation_data and bpy.context.scene.animation_data.action:
@@ -396,71 +589,183 @@ class FBXToMDLConverter:
             print(f"Error loading FBX file: {e}")
             return False
     
+    def _vertex_cache_score(self, cache_pos: int, remaining: int) -> float:
+        """Forsyth score of a vertex from its cache position and remaining triangles"""
+        if remaining == 0:
+            return -1.0  # No triangles left to add
+        
+        score = 0.0
+        if cache_pos >= 0:
+            if cache_pos < 3:
+                # Vertices of the last triangle get a fixed score
+                score = _VCACHE_LAST_TRI_SCORE
+            else:
+                scale = 1.0 / (_VCACHE_SIZE - 3)
+                score = (1.0 - (cache_pos - 3) * scale) ** _VCACHE_DECAY_POWER
+        
+        # Boost vertices with few triangles left so they get finished off
+        return score + _VCACHE_VALENCE_BOOST_SCALE * remaining ** -_VCACHE_VALENCE_BOOST_POWER
+    
+    def optimize_vertex_cache(self, tri_indices: "np.ndarray", num_vertices: int) -> "np.ndarray":
+        """Return a triangle order that improves post-transform vertex cache hits
+        
+        Implements Tom Forsyth's linear-speed vertex cache optimisation.
+        """
+        tris = np.asarray(tri_indices).reshape(-1, 3).tolist()
+        num_tris = len(tris)
+        
+        vertex_tris: List[List[int]] = [[] for _ in range(num_vertices)]
+        for t, tri in enumerate(tris):
+            for v in tri:
+                vertex_tris[v].append(t)
+        
+        cache_pos = [-1] * num_vertices
+        vertex_score = [self._vertex_cache_score(-1, len(vertex_tris[v])) for v in range(num_vertices)]
+        tri_score = [sum(vertex_score[v] for v in tri) for tri in tris]
+        tri_added = [False] * num_tris
+        
+        order = []
+        cache: List[int] = []
+        best_tri = max(range(num_tris), key=tri_score.__getitem__) if num_tris else -1
+        
+        while len(order) < num_tris:
+            if best_tri < 0:
+                # Cache holds no candidates; fall back to a full scan
+                best_tri = max((t for t in range(num_tris) if not tri_added[t]),
+                               key=tri_score.__getitem__)
+            
+            tri = tris[best_tri]
+            tri_added[best_tri] = True
+            order.append(best_tri)
+            for v in tri:
+                vertex_tris[v].remove(best_tri)
+            
+            # Move the triangle's vertices to the front of the LRU cache
+            new_cache = list(dict.fromkeys(tri))
+            new_cache.extend(v for v in cache if v not in new_cache)
+            
+            # Rescore everything whose cache position changed, including evictions
+            touched = set()
+            for pos, v in enumerate(new_cache):
+                cache_pos[v] = pos if pos < _VCACHE_SIZE else -1
+                vertex_score[v] = self._vertex_cache_score(cache_pos[v], len(vertex_tris[v]))
+                touched.update(vertex_tris[v])
+            cache = new_cache[:_VCACHE_SIZE]
+            
+            best_tri = -1
+            best_score = -1.0
+            for t in touched:
+                score = sum(vertex_score[v] for v in tris[t])
+                tri_score[t] = score
+                if score > best_score:
+                    best_tri, best_score = t, score
+        
+        return np.asarray(order, dtype=np.int64)
+    
+    def optimize_mesh_layout(self) -> None:
+        """Reorder packed triangles for the vertex cache and vertices by first use"""
+        if self.tri_indices is None or self.vertices_xyz is None:
+            return
+        
+        num_vertices = len(self.vertices_xyz)
+        order = self.optimize_vertex_cache(self.tri_indices, num_vertices)
+        self.tri_indices = self.tri_indices[order]
+        self.tri_front = self.tri_front[order]
+        
+        # Lay out vertices in the order triangles first reference them,
+        # with unreferenced vertices kept at the end
+        flat = self.tri_indices.reshape(-1)
+        _, first_use = np.unique(flat, return_index=True)
+        used = flat[np.sort(first_use)]
+        unused = np.setdiff1d(np.arange(num_vertices), used)
+        vertex_order = np.concatenate([used, unused]).astype(np.int64)
+        
+        remap = np.empty(num_vertices, dtype=np.uint32)
+        remap[vertex_order] = np.arange(num_vertices, dtype=np.uint32)
+        self.vertices_xyz = self.vertices_xyz[vertex_order]
+        self.vertex_normals = self.vertex_normals[vertex_order]
+        self.tri_indices = remap[self.tri_indices]
+    
     def write_mdl_file(self, output_path: str) -> bool:
         """Write MDL binary file"""
         try:
-            with open(output_path, 'wb') as f:
-                # MDL Header
-                f.write(MDL_MAGIC)  # Magic number "IDPO"
-                f.write(struct.pack('<I', MDL_VERSION))  # Version
-                f.write(struct.pack('<64s', self.model_name.encode('ascii')[:64]))  # Model name
-                f.write(struct.pack('<I', len(self.model_name)))  # Model name length
-                
-                # Bounding box
-                f.write(struct.pack('<fff', *self.bounds_min))
-                f.write(struct.pack('<fff', *self.bounds_max))
-                
-                # Counts
-                f.write(struct.pack('<I', len(self.vertices)))
-                f.write(struct.pack('<I', len(self.triangles)))
-                f.write(struct.pack('<I', len(self.bones)))
-                f.write(struct.pack('<I', len(self.sequences)))
-                f.write(struct.pack('<I', len(self.textures)))
-                
-                # Vertex data
+            vertex_count = self.vertex_count
+            triangle_count = self.triangle_count
+            
+            # Pack the whole file into one preallocated buffer
+            buf = bytearray(_HEADER_S.size +
+                            _VERTEX_S.size * vertex_count +
+                            _TRIANGLE_S.size * triangle_count +
+                            _BONE_S.size * len(self.bones) +
+                            _SEQUENCE_S.size * len(self.sequences) +
+                            _TEXTURE_S.size * len(self.textures))
+            
+            # MDL Header
+            _HEADER_S.pack_into(buf, 0,
+                                MDL_MAGIC,  # Magic number "IDPO"
+                                MDL_VERSION,
+                                _encode_name(self.model_name, 64),
+                                len(self.model_name),
+                                *self.bounds_min, *self.bounds_max,
+                                vertex_count, triangle_count, len(self.bones),
+                                len(self.sequences), len(self.textures))
+            offset = _HEADER_S.size
+            
+            # Vertex data
+            if self.vertices_xyz is not None:
+                if vertex_count:
+                    block = np.frombuffer(buf, dtype=np.uint8, count=4 * vertex_count,
+                                          offset=offset).reshape(vertex_count, 4)
+                    block[:, :3] = self.vertices_xyz
+                    block[:, 3] = self.vertex_normals
+                    del block
+                offset += _VERTEX_S.size * vertex_count
+            else:
                 for vertex in self.vertices:
-                    f.write(struct.pack('<BBBB', vertex.x, vertex.y, vertex.z, vertex.normal_index))
-                
-                # Triangle data
+                    _VERTEX_S.pack_into(buf, offset, vertex.x, vertex.y, vertex.z, vertex.normal_index)
+                    offset += _VERTEX_S.size
+            
+            # Triangle data
+            if self.tri_indices is not None:
+                if triangle_count:
+                    block = np.frombuffer(buf, dtype='<u4', count=4 * triangle_count,
+                                          offset=offset).reshape(triangle_count, 4)
+                    block[:, 0] = self.tri_front
+                    block[:, 1:] = self.tri_indices
+                    del block
+                offset += _TRIANGLE_S.size * triangle_count
+            else:
                 for triangle in self.triangles:
-                    f.write(struct.pack('<I', 1 if triangle.face_front else 0))
-                    f.write(struct.pack('<III', *triangle.vertex_indices))
-                
-                # Bone data
-                for bone in self.bones:
-                    f.write(struct.pack('<32s', bone.name.encode('ascii')[:32]))
-                    f.write(struct.pack('<i', bone.parent))
-                    f.write(struct.pack('<I', bone.flags))
-                    f.write(struct.pack('<fff', *bone.position))
-                    f.write(struct.pack('<fff', *bone.rotation))
-                
-                # Sequence data
-                for seq in self.sequences:
-                    f.write(struct.pack('<32s', seq.name.encode('ascii')[:32]))
-                    f.write(struct.pack('<f', seq.fps))
-                    f.write(struct.pack('<I', seq.flags))
-                    f.write(struct.pack('<I', seq.activity))
-                    f.write(struct.pack('<I', seq.actweight))
-                    f.write(struct.pack('<I', seq.numevents))
-                    f.write(struct.pack('<I', seq.eventindex))
-                    f.write(struct.pack('<I', seq.numframes))
-                    f.write(struct.pack('<I', seq.numblends))
-                    f.write(struct.pack('<I', seq.animindex))
-                    f.write(struct.pack('<I', seq.motiontype))
-                    f.write(struct.pack('<I', seq.motionbone))
-                    f.write(struct.pack('<fff', *seq.linearmovement))
-                    f.write(struct.pack('<I', seq.automoveposindex))
-                    f.write(struct.pack('<I', seq.automoveangleindex))
-                    f.write(struct.pack('<fff', *seq.bbmin))
-                    f.write(struct.pack('<fff', *seq.bbmax))
-                
-                # Texture data
-                for texture in self.textures:
-                    f.write(struct.pack('<64s', texture.name.encode('ascii')[:64]))
-                    f.write(struct.pack('<I', texture.flags))
-                    f.write(struct.pack('<I', texture.width))
-                    f.write(struct.pack('<I', texture.height))
-                    f.write(struct.pack('<I', texture.index))
+                    _TRIANGLE_S.pack_into(buf, offset, 1 if triangle.face_front else 0,
+                                          *triangle.vertex_indices)
+                    offset += _TRIANGLE_S.size
+            
+            # Bone data
+            for bone in self.bones:
+                _BONE_S.pack_into(buf, offset, bone.name_bytes, bone.parent,
+                                  bone.flags, *bone.position, *bone.rotation)
+                offset += _BONE_S.size
+            
+            # Sequence data
+            for seq in self.sequences:
+                _SEQUENCE_S.pack_into(buf, offset, seq.name_bytes, seq.fps,
+                                      seq.flags, seq.activity, seq.actweight,
+                                      seq.numevents, seq.eventindex, seq.numframes,
+                                      seq.numblends, seq.animindex, seq.motiontype,
+                                      seq.motionbone, *seq.linearmovement,
+                                      seq.automoveposindex, seq.automoveangleindex,
+                                      *seq.bbmin, *seq.bbmax)
+                offset += _SEQUENCE_S.size
+            
+            # Texture data
+            for texture in self.textures:
+                _TEXTURE_S.pack_into(buf, offset, texture.name_bytes,
+                                     texture.flags, texture.width, texture.height,
+                                     texture.index)
+                offset += _TEXTURE_S.size
+            
+            with open(output_path, 'wb') as f:
+                f.write(buf)
             
             return True
             
@@ -471,45 +776,21 @@ class FBXToMDLConverter:
     def generate_qc_file(self, mdl_path: str, qc_path: str) -> bool:
         """Generate QC file for StudioMDL"""
         try:
-            qc_content = f'''/*
-==============================================================================
-
-\tMODEL: {self.model_name}
-\tGenerated by FBX to MDL Converter
-
-==============================================================================
-*/
-
-$modelname "{Path(mdl_path).name}"
-$cd "./"
-$cdtexture "./"
-$scale 1.0
-
-'''
-            
-            # Add textures
-            for texture in self.textures:
-                qc_content += f'$texture "{texture.name}"\n'
-            
-            qc_content += '\n'
+            # One line per texture and sequence
+            texture_lines = "".join(f'$texture "{texture.name}"\n' for texture in self.textures)
             
-            # Add body groups
-            qc_content += f'$body "Body" "{self.model_name}"\n\n'
-            
-            # Add sequences
             if self.sequences:
-                for seq in self.sequences:
-                    qc_content += f'$sequence "{seq.name}" "{seq.name}" fps {seq.fps}\n'
+                sequence_lines = "".join(f'$sequence "{seq.name}" "{seq.name}" fps {seq.fps}\n'
+                                         for seq in self.sequences)
             else:
-                qc_content += '$sequence "idle" "idle" fps 30\n'
+                sequence_lines = '$sequence "idle" "idle" fps 30\n'
             
-            # Add collision model
-            qc_content += f'\n$collisionmodel "{self.model_name}_collision" {{\n'
-            qc_content += '\t$mass 1.0\n'
-            qc_content += '\t$inertia 1.0\n'
-            qc_content += '\t$damping 0.0\n'
-            qc_content += '\t$rotdamping 0.0\n'
-            qc_content += '}\n'
+            qc_content = _QC_TEMPLATE.format_map({
+                "model_name": self.model_name,
+                "mdl_name": Path(mdl_path).name,
+                "textures": texture_lines,
+                "sequences": sequence_lines,
+            })
             
             with open(qc_path, 'w') as f:
                 f.write(qc_content)
@@ -520,27 +801,51 @@ $scale 1.0
             print(f"Error generating QC file: {e}")
             return False
     
-    def export_preview_json(self, json_path: str) -> bool:
-        """Export preview data as JSON"""
+    def export_preview_json(self, json_path: str, pretty: bool = False) -> bool:
+        """Export preview data as JSON (indented when pretty, compact otherwise)"""
         try:
+            # Limit vertices/triangles for size
+            limit = 100
+            if self.vertices_xyz is not None:
+                vertices = [{"x": x, "y": y, "z": z, "normal": n} for (x, y, z), n in
+                            zip(self.vertices_xyz[:limit].tolist(), self.vertex_normals[:limit].tolist())]
+            else:
+                vertices = [{"x": v.x, "y": v.y, "z": v.z, "normal": v.normal_index}
+                            for v in islice(self.vertices, limit)]
+            
+            if self.tri_indices is not None:
+                triangles = [{"face_front": bool(ff), "indices": idx} for ff, idx in
+                             zip(self.tri_front[:limit].tolist(), self.tri_indices[:limit].tolist())]
+            else:
+                triangles = [{"face_front": t.face_front, "indices": t.vertex_indices}
+                             for t in islice(self.triangles, limit)]
+            
             preview_data = {
                 "model_name": self.model_name,
                 "bounds_min": self.bounds_min,
                 "bounds_max": self.bounds_max,
-                "vertex_count": len(self.vertices),
-                "triangle_count": len(self.triangles),
+                "vertex_count": self.vertex_count,
+                "triangle_count": self.triangle_count,
                 "bone_count": len(self.bones),
                 "sequence_count": len(self.sequences),
                 "texture_count": len(self.textures),
-                "vertices": [{"x": v.x, "y": v.y, "z": v.z, "normal": v.normal_index} for v in self.vertices[:100]],  # Limit for size
-                "triangles": [{"face_front": t.face_front, "indices": t.vertex_indices} for t in self.triangles[:100]],
+                "vertices": vertices,
+                "triangles": triangles,
                 "bones": [{"name": b.name, "parent": b.parent, "position": b.position} for b in self.bones],
                 "sequences": [{"name": s.name, "fps": s.fps, "frames": s.numframes} for s in self.sequences],
                 "textures": [{"name": t.name, "width": t.width, "height": t.height} for t in self.textures]
             }
             
-            with open(json_path, 'w') as f:
-                json.dump(preview_data, f, indent=2)
+            if ORJSON_AVAILABLE:
+                option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if pretty else 0)
+                with open(json_path, 'wb') as f:
+                    f.write(orjson.dumps(preview_data, option=option))
+            else:
+                with open(json_path, 'w') as f:
+                    if pretty:
+                        json.dump(preview_data, f, indent=2)
+                    else:
+                        json.dump(preview_data, f, separators=(',', ':'))
             
             return True
             
@@ -566,6 +871,8 @@ Examples:
     parser.add_argument('--create-qc', action='store_true', 
                        help='Generate QC file for StudioMDL')
     parser.add_argument('--preview-json', help='Export preview data as JSON')
+    parser.add_argument('--optimize-cache', action='store_true',
+                       help='Reorder triangles and vertices for GPU vertex cache reuse')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Enable verbose output')
     
@@ -598,12 +905,18 @@ Examples:
     
     if args.verbose:
         print(f"Loaded model: {converter.model_name}")
-        print(f"Vertices: {len(converter.vertices)}")
-        print(f"Triangles: {len(converter.triangles)}")
+        print(f"Vertices: {converter.vertex_count}")
+        print(f"Triangles: {converter.triangle_count}")
         print(f"Bones: {len(converter.bones)}")
         print(f"Sequences: {len(converter.sequences)}")
         print(f"Textures: {len(converter.textures)}")
     
+    # Optimize mesh layout if requested
+    if args.optimize_cache:
+        if args.verbose:
+            print("Optimizing vertex cache order")
+        converter.optimize_mesh_layout()
+    
     # Write MDL file
     if args.verbose:
         print(f"Writing MDL file: {args.output_mdl}")
@@ -626,7 +939,7 @@ Examples:
         if args.verbose:
             print(f"Exporting preview JSON: {args.preview_json}")
         
-        if not converter.export_preview_json(args.preview_json):
+        if not converter.export_preview_json(args.preview_json, pretty=args.verbose):
             print("Warning: Failed to export preview JSON")
     
     print(f"Conversion completed successfully!")
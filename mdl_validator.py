@@ -9,13 +9,25 @@ Author: FBX to MDL Converter Tool
 License: MIT
 """
 
+import io
+import mmap
 import os
 import struct
 import sys
-from typing import Dict, List, Tuple, Optional, Any
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple, Optional, Any, Iterable
 from dataclasses import dataclass
 from pathlib import Path
 
+# Check for numpy availability
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    # Numpy is optional; the per-record loops are used instead
+
 # MDL Format constants
 MDL_MAGIC = b'IDPO'
 MDL_VERSION = 6
@@ -25,6 +37,36 @@ MAX_BONES_CS16 = 128
 MAX_SEQUENCES_CS16 = 32
 MAX_TEXTURES_CS16 = 32
 
+# Precompiled little-endian layouts
+_U32_S = struct.Struct('<I')
+_I32_S = struct.Struct('<i')
+_F32_S = struct.Struct('<f')
+# (singular, plural, CS 1.6 limit, warn when approaching), in header count order
+_COUNT_LIMITS = (
+    ("vertex", "vertices", MAX_VERTICES_CS16, True),
+    ("triangle", "triangles", MAX_TRIANGLES_CS16, True),
+    ("bone", "bones", MAX_BONES_CS16, True),
+    ("sequence", "sequences", MAX_SEQUENCES_CS16, False),
+    ("texture", "textures", MAX_TEXTURES_CS16, False),
+)
+
+_HEADER_S = struct.Struct('<4sI64sI3f3f')  # magic, version, name, name length, bounds
+_COUNTS_S = struct.Struct('<5I')  # vertices, triangles, bones, sequences, textures
+_TRIANGLE_S = struct.Struct('<4I')  # face_front, three vertex indices
+_TEX_DIMS_S = struct.Struct('<II')  # texture width, height
+
+def _decode_name(mv: memoryview, offset: int, width: int) -> str:
+    """Decode a NUL-terminated ASCII name field in place"""
+    # mv spans the whole file, so offsets are valid in the underlying mmap/bytes object
+    end = mv.obj.find(b'\x00', offset, offset + width)
+    if end < 0:
+        end = offset + width
+    return str(mv[offset:end], 'ascii', 'ignore')
+
+def _decode_names(mv: memoryview, cursor: int, count: int, stride: int, width: int) -> List[str]:
+    """Decode the leading name field of count fixed-size records starting at cursor"""
+    return [_decode_name(mv, offset, width) for offset in range(cursor, cursor + count * stride, stride)]
+
 @dataclass
 class ValidationResult:
     """Result of MDL validation"""
@@ -36,7 +78,8 @@ class ValidationResult:
 class MDLValidator:
     """Validates MDL files for CS 1.6 compatibility"""
     
-    def __init__(self):
+    def __init__(self, verbose: bool = False):
+        self.verbose = verbose
         self.reset_validation()
     
     def reset_validation(self):
@@ -48,12 +91,14 @@ class MDLValidator:
     def add_error(self, message: str):
         """Add error message"""
         self.errors.append(message)
-        print(f"ERROR: {message}")
+        if self.verbose:
+            print(f"ERROR: {message}")
     
     def add_warning(self, message: str):
         """Add warning message"""
         self.warnings.append(message)
-        print(f"WARNING: {message}")
+        if self.verbose:
+            print(f"WARNING: {message}")
     
     def add_info(self, key: str, value: Any):
         """Add info item"""
@@ -62,82 +107,106 @@ class MDLValidator:
     def validate_file(self, mdl_path: str) -> ValidationResult:
         """Validate an MDL file"""
         self.reset_validation()
+        completed = self._validate_path(mdl_path)
         
+        # Overall validation
+        is_valid = completed and len(self.errors) == 0
+        
+        if completed and self.verbose:
+            if is_valid:
+                print(f"✅ MDL file validation passed: {mdl_path}")
+            else:
+                print(f"❌ MDL file validation failed: {mdl_path}")
+        
+        # Copies, so a later validate_file call cannot change this result
+        return ValidationResult(is_valid, list(self.warnings), list(self.errors), dict(self.info))
+    
+    def _validate_path(self, mdl_path: str) -> bool:
+        """Run all checks on an MDL file; False if validation had to stop early"""
         if not os.path.exists(mdl_path):
             self.add_error(f"MDL file not found: {mdl_path}")
-            return ValidationResult(False, self.warnings, self.errors, self.info)
+            return False
         
         file_size = os.path.getsize(mdl_path)
         self.add_info("file_size", file_size)
         
         if file_size < 100:
             self.add_error("MDL file too small (< 100 bytes)")
-            return ValidationResult(False, self.warnings, self.errors, self.info)
+            return False
         
         try:
             with open(mdl_path, 'rb') as f:
-                # Validate header
-                if not self._validate_header(f):
-                    return ValidationResult(False, self.warnings, self.errors, self.info)
-                
-                # Read counts and validate
-                if not self._validate_counts(f):
-                    return ValidationResult(False, self.warnings, self.errors, self.info)
+                try:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (OSError, ValueError):
+                    # Not mappable (e.g. some network filesystems): read it in one call
+                    return self._validate_buffer(f.read())
                 
-                # Validate data sections
-                if not self._validate_data_sections(f):
-                    return ValidationResult(False, self.warnings, self.errors, self.info)
+                with mm:
+                    return self._validate_buffer(mm)
         
         except Exception as e:
             self.add_error(f"Error reading MDL file: {e}")
-            return ValidationResult(False, self.warnings, self.errors, self.info)
-        
-        # Overall validation
-        is_valid = len(self.errors) == 0
+            return False
+    
+    def _validate_buffer(self, data) -> bool:
+        """Validate an in-memory MDL image"""
+        mv = memoryview(data)
+        try:
+            # Validate header
+            cursor = self._validate_header(mv, 0)
+            if cursor is None:
+                return False
+            
+            # Read counts and validate
+            cursor = self._validate_counts(mv, cursor)
+            if cursor is None:
+                return False
+            
+            # Validate data sections
+            return self._validate_data_sections(mv, cursor) is not None
         
-        if is_valid:
-            print(f"✅ MDL file validation passed: {mdl_path}")
-        else:
-            print(f"❌ MDL file validation failed: {mdl_path}")
+        except Exception as e:
+            self.add_error(f"Error reading MDL file: {e}")
+            return False
         
-        return ValidationResult(is_valid, self.warnings, self.errors, self.info)
+        finally:
+            # Views into an mmap must be released before it is closed
+            mv.release()
     
-    def _validate_header(self, f) -> bool:
+    def _validate_header(self, mv: memoryview, cursor: int) -> Optional[int]:
         """Validate MDL header"""
+        magic, version, _, name_length, *bounds = _HEADER_S.unpack_from(mv, cursor)
+        
         # Check magic number
-        magic = f.read(4)
         if magic != MDL_MAGIC:
             self.add_error(f"Invalid magic number: {magic} (expected {MDL_MAGIC})")
-            return False
+            return None
         
         self.add_info("magic", magic.decode('ascii', errors='ignore'))
         
         # Check version
-        version = struct.unpack('<I', f.read(4))[0]
         if version != MDL_VERSION:
             self.add_error(f"Invalid version: {version} (expected {MDL_VERSION})")
-            return False
+            return None
         
         self.add_info("version", version)
         
         # Read model name
-        name_bytes = f.read(64)
-        model_name = name_bytes.split(b'\x00')[0].decode('ascii', errors='ignore')
+        model_name = _decode_name(mv, cursor + 8, 64)
         self.add_info("model_name", model_name)
         
         if not model_name:
             self.add_warning("Model name is empty")
         
-        # Read name length
-        name_length = struct.unpack('<I', f.read(4))[0]
+        # Check name length
         self.add_info("name_length", name_length)
         
         if name_length != len(model_name):
             self.add_warning(f"Name length mismatch: {name_length} vs {len(model_name)}")
         
-        # Read bounding box
-        bounds_min = struct.unpack('<fff', f.read(12))
-        bounds_max = struct.unpack('<fff', f.read(12))
+        # Check bounding box
+        bounds_min, bounds_max = tuple(bounds[:3]), tuple(bounds[3:])
         
         self.add_info("bounds_min", bounds_min)
         self.add_info("bounds_max", bounds_max)
@@ -147,44 +216,21 @@ class MDLValidator:
             if bounds_min[i] >= bounds_max[i]:
                 self.add_warning(f"Invalid bounding box: min[{i}] >= max[{i}]")
         
-        return True
+        return cursor + _HEADER_S.size
     
-    def _validate_counts(self, f) -> bool:
+    def _validate_counts(self, mv: memoryview, cursor: int) -> Optional[int]:
         """Validate object counts"""
         # Read counts
-        vertex_count = struct.unpack('<I', f.read(4))[0]
-        triangle_count = struct.unpack('<I', f.read(4))[0]
-        bone_count = struct.unpack('<I', f.read(4))[0]
-        sequence_count = struct.unpack('<I', f.read(4))[0]
-        texture_count = struct.unpack('<I', f.read(4))[0]
-        
-        self.add_info("vertex_count", vertex_count)
-        self.add_info("triangle_count", triangle_count)
-        self.add_info("bone_count", bone_count)
-        self.add_info("sequence_count", sequence_count)
-        self.add_info("texture_count", texture_count)
+        counts = _COUNTS_S.unpack_from(mv, cursor)
+        vertex_count, triangle_count = counts[0], counts[1]
         
         # Validate counts against CS 1.6 limits
-        if vertex_count > MAX_VERTICES_CS16:
-            self.add_error(f"Too many vertices: {vertex_count} (max {MAX_VERTICES_CS16})")
-        elif vertex_count > MAX_VERTICES_CS16 * 0.8:
-            self.add_warning(f"High vertex count: {vertex_count} (approaching limit)")
-        
-        if triangle_count > MAX_TRIANGLES_CS16:
-            self.add_error(f"Too many triangles: {triangle_count} (max {MAX_TRIANGLES_CS16})")
-        elif triangle_count > MAX_TRIANGLES_CS16 * 0.8:
-            self.add_warning(f"High triangle count: {triangle_count} (approaching limit)")
-        
-        if bone_count > MAX_BONES_CS16:
-            self.add_error(f"Too many bones: {bone_count} (max {MAX_BONES_CS16})")
-        elif bone_count > MAX_BONES_CS16 * 0.8:
-            self.add_warning(f"High bone count: {bone_count} (approaching limit)")
-        
-        if sequence_count > MAX_SEQUENCES_CS16:
-            self.add_error(f"Too many sequences: {sequence_count} (max {MAX_SEQUENCES_CS16})")
-        
-        if texture_count > MAX_TEXTURES_CS16:
-            self.add_error(f"Too many textures: {texture_count} (max {MAX_TEXTURES_CS16})")
+        for (singular, plural, limit, warn), count in zip(_COUNT_LIMITS, counts):
+            self.add_info(f"{singular}_count", count)
+            if count > limit:
+                self.add_error(f"Too many {plural}: {count} (max {limit})")
+            elif warn and count > limit * 0.8:
+                self.add_warning(f"High {singular} count: {count} (approaching limit)")
         
         # Check for empty model
         if vertex_count == 0:
@@ -193,9 +239,15 @@ class MDLValidator:
         if triangle_count == 0:
             self.add_warning("Model has no triangles")
         
-        return True
+        # Counts this far past the limits mean a corrupt header; don't parse the sections
+        for (singular, _, limit, _), count in zip(_COUNT_LIMITS, counts):
+            if count >= limit * 10:
+                self.add_error(f"Implausible {singular} count: {count} (header is likely corrupt)")
+                return None
+        
+        return cursor + _COUNTS_S.size
     
-    def _validate_data_sections(self, f) -> bool:
+    def _validate_data_sections(self, mv: memoryview, cursor: int) -> Optional[int]:
         """Validate data sections"""
         vertex_count = self.info["vertex_count"]
         triangle_count = self.info["triangle_count"]
@@ -204,123 +256,116 @@ class MDLValidator:
         texture_count = self.info["texture_count"]
         
         # Validate vertices
-        if not self._validate_vertices(f, vertex_count):
-            return False
+        cursor = self._validate_vertices(mv, cursor, vertex_count)
+        if cursor is None:
+            return None
         
         # Validate triangles
-        if not self._validate_triangles(f, triangle_count, vertex_count):
-            return False
+        cursor = self._validate_triangles(mv, cursor, triangle_count, vertex_count)
+        if cursor is None:
+            return None
         
         # Validate bones
-        if not self._validate_bones(f, bone_count):
-            return False
+        cursor = self._validate_bones(mv, cursor, bone_count)
+        if cursor is None:
+            return None
         
         # Validate sequences
-        if not self._validate_sequences(f, sequence_count):
-            return False
+        cursor = self._validate_sequences(mv, cursor, sequence_count)
+        if cursor is None:
+            return None
         
         # Validate textures
-        if not self._validate_textures(f, texture_count):
-            return False
+        cursor = self._validate_textures(mv, cursor, texture_count)
+        if cursor is None:
+            return None
         
-        return True
+        return cursor
     
-    def _validate_vertices(self, f, count: int) -> bool:
+    def _validate_vertices(self, mv: memoryview, cursor: int, count: int) -> Optional[int]:
         """Validate vertex data"""
         if count == 0:
-            return True
+            return cursor
         
         try:
-            vertex_data = f.read(count * 4)  # 4 bytes per vertex (x,y,z,normal_index)
+            vertex_data = mv[cursor:cursor + count * 4]  # 4 bytes per vertex (x,y,z,normal_index)
             
             if len(vertex_data) != count * 4:
                 self.add_error(f"Insufficient vertex data: {len(vertex_data)} bytes (expected {count * 4})")
-                return False
+                return None
             
-            # Check individual vertices
-            invalid_vertices = 0
-            for i in range(count):
-                offset = i * 4
-                x, y, z, normal_idx = struct.unpack('BBBB', vertex_data[offset:offset + 4])
-                
-                # Validate coordinates (should be 0-255)
-                if x > 255 or y > 255 or z > 255:
-                    invalid_vertices += 1
-                
-                # Validate normal index (should be 0-161)
-                if normal_idx > 161:
-                    invalid_vertices += 1
+            # Coordinates are single bytes, so only the normal index (0-161) can be out of range
+            if NUMPY_AVAILABLE:
+                vertices = np.frombuffer(vertex_data, dtype=np.uint8).reshape(count, 4)
+                invalid_vertices = int((vertices[:, 3] > 161).sum())
+            else:
+                invalid_vertices = sum(1 for normal_idx in vertex_data[3::4] if normal_idx > 161)
             
             if invalid_vertices > 0:
                 self.add_warning(f"{invalid_vertices} vertices have invalid data")
             
             self.add_info("vertices_validated", True)
-            return True
+            return cursor + count * 4
             
         except Exception as e:
             self.add_error(f"Error validating vertices: {e}")
-            return False
+            return None
     
-    def _validate_triangles(self, f, count: int, vertex_count: int) -> bool:
+    def _validate_triangles(self, mv: memoryview, cursor: int, count: int, vertex_count: int) -> Optional[int]:
         """Validate triangle data"""
         if count == 0:
-            return True
+            return cursor
         
         try:
-            triangle_data = f.read(count * 16)  # 16 bytes per triangle
+            triangle_data = mv[cursor:cursor + count * 16]  # 16 bytes per triangle
             
             if len(triangle_data) != count * 16:
                 self.add_error(f"Insufficient triangle data: {len(triangle_data)} bytes (expected {count * 16})")
-                return False
-            
-            # Check individual triangles
-            invalid_triangles = 0
-            for i in range(count):
-                offset = i * 16
-                face_front = struct.unpack('<I', triangle_data[offset:offset + 4])[0]
-                v1, v2, v3 = struct.unpack('<III', triangle_data[offset + 4:offset + 16])
-                
-                # Validate vertex indices
-                if v1 >= vertex_count or v2 >= vertex_count or v3 >= vertex_count:
-                    invalid_triangles += 1
-                
-                # Check for degenerate triangles
-                if v1 == v2 or v2 == v3 or v1 == v3:
-                    invalid_triangles += 1
+                return None
+            
+            # Out-of-range indices and degenerate triangles each count once
+            if NUMPY_AVAILABLE:
+                tri = np.frombuffer(triangle_data, dtype='<u4').reshape(count, 4)
+                v1, v2, v3 = tri[:, 1], tri[:, 2], tri[:, 3]
+                bad_index = (tri[:, 1:] >= vertex_count).any(axis=1)
+                degenerate = (v1 == v2) | (v2 == v3) | (v1 == v3)
+                invalid_triangles = int(bad_index.sum()) + int(degenerate.sum())
+            else:
+                invalid_triangles = 0
+                for face_front, v1, v2, v3 in _TRIANGLE_S.iter_unpack(triangle_data):
+                    if v1 >= vertex_count or v2 >= vertex_count or v3 >= vertex_count:
+                        invalid_triangles += 1
+                    if v1 == v2 or v2 == v3 or v1 == v3:
+                        invalid_triangles += 1
             
             if invalid_triangles > 0:
                 self.add_warning(f"{invalid_triangles} triangles have invalid vertex indices")
             
             self.add_info("triangles_validated", True)
-            return True
+            return cursor + count * 16
             
         except Exception as e:
             self.add_error(f"Error validating triangles: {e}")
-            return False
+            return None
     
-    def _validate_bones(self, f, count: int) -> bool:
+    def _validate_bones(self, mv: memoryview, cursor: int, count: int) -> Optional[int]:
         """Validate bone data"""
         if count == 0:
-            return True
+            return cursor
         
         try:
-            bone_data = f.read(count * 56)  # 56 bytes per bone
+            bone_data = mv[cursor:cursor + count * 56]  # 56 bytes per bone
             
             if len(bone_data) != count * 56:
                 self.add_error(f"Insufficient bone data: {len(bone_data)} bytes (expected {count * 56})")
-                return False
+                return None
+            
+            bone_names = _decode_names(mv, cursor, count, 56, 32)
             
             # Check bone hierarchy
             invalid_bones = 0
-            bone_names = []
-            
             for i in range(count):
-                offset = i * 56
-                name_bytes = bone_data[offset:offset + 32]
-                bone_name = name_bytes.split(b'\x00')[0].decode('ascii', errors='ignore')
-                bone_names.append(bone_name)
-                
-                parent_idx = struct.unpack('<i', bone_data[offset + 32:offset + 36])[0]
+                parent_idx = _I32_S.unpack_from(bone_data, i * 56 + 32)[0]
                 
                 # Validate parent index
                 if parent_idx >= i and parent_idx != -1:
@@ -332,204 +377,201 @@ class MDLValidator:
             if invalid_bones > 0:
                 self.add_warning(f"{invalid_bones} bones have invalid parent references")
             
-            # Check for duplicate bone names
-            unique_names = set(bone_names)
-            if len(unique_names) != len(bone_names):
+            # Check for duplicate bone names (a set beats np.unique at <= 128 names)
+            if len(set(bone_names)) != len(bone_names):
                 self.add_warning("Duplicate bone names detected")
             
             self.add_info("bones_validated", True)
             self.add_info("bone_names", bone_names)
-            return True
+            return cursor + count * 56
             
         except Exception as e:
             self.add_error(f"Error validating bones: {e}")
-            return False
+            return None
     
-    def _validate_sequences(self, f, count: int) -> bool:
+    def _validate_sequences(self, mv: memoryview, cursor: int, count: int) -> Optional[int]:
         """Validate animation sequence data"""
         if count == 0:
-            return True
+            return cursor
         
         try:
-            sequence_data = f.read(count * 176)  # 176 bytes per sequence
+            sequence_data = mv[cursor:cursor + count * 176]  # 176 bytes per sequence
             
             if len(sequence_data) != count * 176:
                 self.add_error(f"Insufficient sequence data: {len(sequence_data)} bytes (expected {count * 176})")
-                return False
-            
-            sequence_names = []
-            invalid_sequences = 0
-            
-            for i in range(count):
-                offset = i * 176
-                name_bytes = sequence_data[offset:offset + 32]
-                seq_name = name_bytes.split(b'\x00')[0].decode('ascii', errors='ignore')
-                sequence_names.append(seq_name)
-                
-                fps = struct.unpack('<f', sequence_data[offset + 32:offset + 36])[0]
-                numframes = struct.unpack('<I', sequence_data[offset + 60:offset + 64])[0]
-                
-                # Validate FPS
-                if fps <= 0 or fps > 120:
-                    invalid_sequences += 1
-                
-                # Validate frame count
-                if numframes == 0:
-                    invalid_sequences += 1
+                return None
+            
+            sequence_names = _decode_names(mv, cursor, count, 176, 32)
+            
+            # Bad fps and zero frame counts each count once
+            if NUMPY_AVAILABLE:
+                fps = np.frombuffer(sequence_data, dtype='<f4')[8::44]  # offset 32
+                numframes = np.frombuffer(sequence_data, dtype='<u4')[15::44]  # offset 60
+                invalid_sequences = int(((fps <= 0) | (fps > 120)).sum()) + int((numframes == 0).sum())
+            else:
+                invalid_sequences = 0
+                for i in range(count):
+                    offset = i * 176
+                    fps = _F32_S.unpack_from(sequence_data, offset + 32)[0]
+                    numframes = _U32_S.unpack_from(sequence_data, offset + 60)[0]
+                    
+                    # Validate FPS
+                    if fps <= 0 or fps > 120:
+                        invalid_sequences += 1
+                    
+                    # Validate frame count
+                    if numframes == 0:
+                        invalid_sequences += 1
             
             if invalid_sequences > 0:
                 self.add_warning(f"{invalid_sequences} sequences have invalid parameters")
             
             self.add_info("sequences_validated", True)
             self.add_info("sequence_names", sequence_names)
-            return True
+            return cursor + count * 176
             
         except Exception as e:
             self.add_error(f"Error validating sequences: {e}")
-            return False
+            return None
     
-    def _validate_textures(self, f, count: int) -> bool:
+    def _validate_textures(self, mv: memoryview, cursor: int, count: int) -> Optional[int]:
         """Validate texture data"""
         if count == 0:
-            return True
+            return cursor
         
         try:
-            texture_data = f.read(count * 80)  # 80 bytes per texture
+            texture_data = mv[cursor:cursor + count * 80]  # 80 bytes per texture
             
             if len(texture_data) != count * 80:
                 self.add_error(f"Insufficient texture data: {len(texture_data)} bytes (expected {count * 80})")
-                return False
-            
-            texture_names = []
-            invalid_textures = 0
-            
-            for i in range(count):
-                offset = i * 80
-                name_bytes = texture_data[offset:offset + 64]
-                tex_name = name_bytes.split(b'\x00')[0].decode('ascii', errors='ignore')
-                texture_names.append(tex_name)
-                
-                width = struct.unpack('<I', texture_data[offset + 68:offset + 72])[0]
-                height = struct.unpack('<I', texture_data[offset + 72:offset + 76])[0]
-                
-                # Validate dimensions
-                if width == 0 or height == 0:
-                    invalid_textures += 1
-                
-                # Check if power of 2
-                if not self._is_power_of_two(width) or not self._is_power_of_two(height):
-                    invalid_textures += 1
-                
-                # Check reasonable size limits
-                if width > 512 or height > 512 or width < 16 or height < 16:
-                    invalid_textures += 1
+                return None
+            
+            texture_names = _decode_names(mv, cursor, count, 80, 64)
+            
+            # Zero size, non power of 2 and out-of-range size each count once
+            if NUMPY_AVAILABLE:
+                fields = np.frombuffer(texture_data, dtype='<u4')
+                widths, heights = fields[17::20], fields[18::20]  # offsets 68 and 72
+                zero = (widths == 0) | (heights == 0)
+                not_po2 = zero | ((widths & (widths - 1)) != 0) | ((heights & (heights - 1)) != 0)
+                out_of_range = (widths > 512) | (heights > 512) | (widths < 16) | (heights < 16)
+                invalid_textures = int(zero.sum()) + int(not_po2.sum()) + int(out_of_range.sum())
+            else:
+                invalid_textures = 0
+                for i in range(count):
+                    width, height = _TEX_DIMS_S.unpack_from(texture_data, i * 80 + 68)
+                    
+                    if width == 0 or height == 0:
+                        invalid_textures += 1
+                    if width & (width - 1) or height & (height - 1) or not (width and height):
+                        invalid_textures += 1
+                    if width > 512 or height > 512 or width < 16 or height < 16:
+                        invalid_textures += 1
             
             if invalid_textures > 0:
                 self.add_warning(f"{invalid_textures} textures have invalid dimensions")
             
             self.add_info("textures_validated", True)
             self.add_info("texture_names", texture_names)
-            return True
+            return cursor + count * 80
             
         except Exception as e:
             self.add_error(f"Error validating textures: {e}")
-            return False
-    
-    def _is_power_of_two(self, n: int) -> bool:
-        """Check if number is power of 2"""
-        return n > 0 and (n & (n - 1)) == 0
+            return None
     
     def generate_report(self, validation_result: ValidationResult, output_path: Optional[str] = None) -> str:
         """Generate detailed validation report"""
-        report_lines = []
+        buf = io.StringIO()
+        w = buf.write
         
         # Header
-        report_lines.append("=" * 60)
-        report_lines.append("MDL FILE VALIDATION REPORT")
-        report_lines.append("=" * 60)
-        report_lines.append("")
+        w("=" * 60 + "\n")
+        w("MDL FILE VALIDATION REPORT\n")
+        w("=" * 60 + "\n")
+        w("\n")
         
         # Overall status
         status = "✅ VALID" if validation_result.valid else "❌ INVALID"
-        report_lines.append(f"Overall Status: {status}")
-        report_lines.append("")
+        w(f"Overall Status: {status}\n")
+        w("\n")
         
         # Basic info
         if validation_result.info:
-            report_lines.append("Model Information:")
-            report_lines.append("-" * 30)
+            w("Model Information:\n")
+            w("-" * 30 + "\n")
             
             for key, value in validation_result.info.items():
                 if key in ["model_name", "version", "file_size", "vertex_count", 
                           "triangle_count", "bone_count", "sequence_count", "texture_count"]:
-                    report_lines.append(f"  {key.replace('_', ' ').title()}: {value}")
+                    w(f"  {key.replace('_', ' ').title()}: {value}\n")
             
-            report_lines.append("")
+            w("\n")
         
         # Errors
         if validation_result.errors:
-            report_lines.append(f"Errors ({len(validation_result.errors)}):")
-            report_lines.append("-" * 30)
+            w(f"Errors ({len(validation_result.errors)}):\n")
+            w("-" * 30 + "\n")
             for error in validation_result.errors:
-                report_lines.append(f"  ❌ {error}")
-            report_lines.append("")
+                w(f"  ❌ {error}\n")
+            w("\n")
         
         # Warnings
         if validation_result.warnings:
-            report_lines.append(f"Warnings ({len(validation_result.warnings)}):")
-            report_lines.append("-" * 30)
+            w(f"Warnings ({len(validation_result.warnings)}):\n")
+            w("-" * 30 + "\n")
             for warning in validation_result.warnings:
-                report_lines.append(f"  ⚠️  {warning}")
-            report_lines.append("")
+                w(f"  ⚠️  {warning}\n")
+            w("\n")
         
         # Detailed info
         if validation_result.info:
             if "bone_names" in validation_result.info:
-                report_lines.append("Bone Hierarchy:")
-                report_lines.append("-" * 30)
+                w("Bone Hierarchy:\n")
+                w("-" * 30 + "\n")
                 for i, name in enumerate(validation_result.info["bone_names"]):
-                    report_lines.append(f"  {i}: {name}")
-                report_lines.append("")
+                    w(f"  {i}: {name}\n")
+                w("\n")
             
             if "sequence_names" in validation_result.info:
-                report_lines.append("Animation Sequences:")
-                report_lines.append("-" * 30)
+                w("Animation Sequences:\n")
+                w("-" * 30 + "\n")
                 for i, name in enumerate(validation_result.info["sequence_names"]):
-                    report_lines.append(f"  {i}: {name}")
-                report_lines.append("")
+                    w(f"  {i}: {name}\n")
+                w("\n")
             
             if "texture_names" in validation_result.info:
-                report_lines.append("Textures:")
-                report_lines.append("-" * 30)
+                w("Textures:\n")
+                w("-" * 30 + "\n")
                 for i, name in enumerate(validation_result.info["texture_names"]):
-                    report_lines.append(f"  {i}: {name}")
-                report_lines.append("")
+                    w(f"  {i}: {name}\n")
+                w("\n")
         
         # Recommendations
         if not validation_result.valid or validation_result.warnings:
-            report_lines.append("Recommendations:")
-            report_lines.append("-" * 30)
+            w("Recommendations:\n")
+            w("-" * 30 + "\n")
             
             if validation_result.errors:
-                report_lines.append("  • Fix all errors before using in CS 1.6")
+                w("  • Fix all errors before using in CS 1.6\n")
             
             if validation_result.warnings:
-                report_lines.append("  • Review warnings for potential issues")
+                w("  • Review warnings for potential issues\n")
             
             # Specific recommendations based on data
             info = validation_result.info
             if info.get("vertex_count", 0) > MAX_VERTICES_CS16 * 0.8:
-                report_lines.append("  • Consider reducing vertex count for better performance")
+                w("  • Consider reducing vertex count for better performance\n")
             
             if info.get("triangle_count", 0) > MAX_TRIANGLES_CS16 * 0.8:
-                report_lines.append("  • Consider reducing triangle count for better performance")
+                w("  • Consider reducing triangle count for better performance\n")
             
             if info.get("bone_count", 0) > 64:
-                report_lines.append("  • High bone count may impact performance")
+                w("  • High bone count may impact performance\n")
             
-            report_lines.append("")
+            w("\n")
         
-        report_text = "\n".join(report_lines)
+        # Drop the newline after the final blank line, as "\n".join did
+        report_text = buf.getvalue()[:-1]
         
         # Save to file if requested
         if output_path:
@@ -542,24 +584,77 @@ class MDLValidator:
         
         return report_text
 
+def _validate_one(mdl_path: str) -> ValidationResult:
+    """Validate a single MDL file (module level so worker processes can pickle it)"""
+    return MDLValidator(verbose=False).validate_file(mdl_path)
+
+def validate_many(mdl_paths: Iterable[str], max_workers: Optional[int] = None) -> List[ValidationResult]:
+    """Validate several MDL files in parallel, returning results in input order"""
+    paths = [str(path) for path in mdl_paths]
+    if len(paths) <= 1:
+        return [_validate_one(path) for path in paths]
+    
+    workers = min(max_workers or os.cpu_count() or 1, len(paths))
+    # Spawn rather than fork: forking a caller with BLAS or worker threads running can deadlock
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(_validate_one, paths, chunksize=max(1, len(paths) // (workers * 4))))
+
 def main():
     """CLI for MDL validator"""
     import argparse
     
     parser = argparse.ArgumentParser(description="Validate MDL files for CS 1.6 compatibility")
-    parser.add_argument('mdl_file', help='Path to MDL file to validate')
+    parser.add_argument('mdl_file', nargs='?', help='Path to MDL file to validate')
+    parser.add_argument('--batch', '-b', metavar='DIR', help='Validate every .mdl file in DIR in parallel')
     parser.add_argument('--report', '-r', help='Save detailed report to file')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
     
     args = parser.parse_args()
     
+    if args.batch and (args.mdl_file or args.report):
+        parser.error("--batch cannot be combined with an MDL file or --report")
+    
+    if args.batch:
+        mdl_paths = sorted(str(path) for path in Path(args.batch).glob('*.mdl'))
+        if not mdl_paths:
+            print(f"Error: no MDL files found in: {args.batch}")
+            return 1
+        
+        results = validate_many(mdl_paths)
+        for mdl_path, result in zip(mdl_paths, results):
+            status = "✅ passed" if result.valid else "❌ failed"
+            print(f"{status}: {mdl_path}")
+            if args.verbose:
+                for error in result.errors:
+                    print(f"ERROR: {mdl_path}: {error}")
+                for warning in result.warnings:
+                    print(f"WARNING: {mdl_path}: {warning}")
+        
+        valid_count = sum(result.valid for result in results)
+        print(f"{valid_count}/{len(results)} MDL files valid")
+        return 0 if valid_count == len(results) else 1
+    
+    if not args.mdl_file:
+        parser.error("an MDL file or --batch DIR is required")
+    
     if not os.path.exists(args.mdl_file):
         print(f"Error: MDL file not found: {args.mdl_file}")
         return 1
     
-    validator = MDLValidator()
+    validator = MDLValidator(verbose=args.verbose)
     result = validator.validate_file(args.mdl_file)
     
+    if not args.verbose:
+        for error in result.errors:
+            print(f"ERROR: {error}")
+        for warning in result.warnings:
+            print(f"WARNING: {warning}")
+        if result.valid:
+            print(f"✅ MDL file validation passed: {args.mdl_file}")
+        else:
+            print(f"❌ MDL file validation failed: {args.mdl_file}")
+    
     if args.verbose or args.report:
         report = validator.generate_report(result, args.report)
         if args.verbose:
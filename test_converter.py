@@ -11,6 +11,7 @@ License: MIT
 
 import unittest
 import tempfile
+from unittest import mock
 import os
 import sys
 import struct
@@ -29,8 +30,10 @@ from fbx_to_mdl_converter import (
     MDLTexture,
     MDL_MAGIC, 
     MDL_VERSION,
-    MDL_ANORMS
+    MDL_ANORMS,
+    NUMPY_AVAILABLE
 )
+from texture_processor import TextureProcessor, PIL_AVAILABLE, _collect_textures
 
 class TestMDLDataStructures(unittest.TestCase):
     """Test MDL data structure classes"""
@@ -61,6 +64,33 @@ class TestMDLDataStructures(unittest.TestCase):
         self.assertEqual(bone.name, "root")
         self.assertEqual(bone.parent, -1)
         self.assertEqual(bone.position, (0.0, 0.0, 0.0))
+    
+    def test_encoded_name_fields(self):
+        """Test names are encoded as null-padded fixed-width ASCII"""
+        bone = MDLBone(name="bip01_spine_" + "x" * 40, parent=-1, flags=0,
+                       position=(0.0, 0.0, 0.0), rotation=(0.0, 0.0, 0.0))
+        self.assertEqual(bone.name_bytes, b"bip01_spine_" + b"x" * 20)
+        
+        texture = MDLTexture(name="skin_é.bmp", flags=0, width=256, height=256, index=0)
+        self.assertEqual(len(texture.name_bytes), 64)
+        self.assertTrue(texture.name_bytes.startswith(b"skin_?.bmp\0"))
+    
+    def test_encoded_name_follows_rename(self):
+        """Test a renamed bone writes its new name, not the one it was created with"""
+        bone = MDLBone(name="root", parent=-1, flags=0,
+                       position=(0.0, 0.0, 0.0), rotation=(0.0, 0.0, 0.0))
+        bone.name = "pelvis"
+        self.assertEqual(bone.name_bytes, b"pelvis".ljust(32, b"\0"))
+        
+        converter = FBXToMDLConverter()
+        converter.bones.append(bone)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "renamed.mdl")
+            self.assertTrue(converter.write_mdl_file(output_path))
+            with open(output_path, 'rb') as f:
+                data = f.read()
+        self.assertIn(b"pelvis\0", data)
+        self.assertNotIn(b"root", data)
 
 class TestFBXToMDLConverter(unittest.TestCase):
     """Test the main converter class"""
@@ -102,6 +132,20 @@ class TestFBXToMDLConverter(unittest.TestCase):
         index = self.converter.find_closest_normal(arbitrary_normal)
         self.assertTrue(0 <= index < len(MDL_ANORMS))
     
+    @unittest.skipUnless(NUMPY_AVAILABLE, "numpy not available")
+    def test_find_closest_normals_batch(self):
+        """Test batched normal mapping matches the per-vector lookup"""
+        import numpy as np
+        
+        normals = np.array(MDL_ANORMS + [(0.5, 0.5, 0.7071), (0.0, 0.0, -1.0)], dtype=np.float32)
+        indices = self.converter.find_closest_normals_batch(normals)
+        
+        self.assertEqual(indices.shape, (len(normals),))
+        self.assertEqual(indices.dtype, np.uint8)
+        self.assertEqual(indices[:len(MDL_ANORMS)].tolist(), list(range(len(MDL_ANORMS))))
+        for normal, index in zip(normals.tolist(), indices.tolist()):
+            self.assertEqual(index, self.converter.find_closest_normal(normal))
+    
     def test_compress_vertex(self):
         """Test vertex compression to 0-255 range"""
         bounds_min = (-10.0, -5.0, -2.0)
@@ -122,6 +166,80 @@ class TestFBXToMDLConverter(unittest.TestCase):
         compressed = self.converter.compress_vertex(vertex, bounds_min, bounds_max)
         self.assertEqual(compressed, (255, 255, 255))
     
+    @unittest.skipUnless(NUMPY_AVAILABLE, "numpy not available")
+    def test_find_closest_normals_large_batch(self):
+        """Test batches spanning several score blocks pick a best-scoring anorm"""
+        import numpy as np
+        from fbx_to_mdl_converter import ANORMS_NP, NORMAL_BLOCK_ROWS
+        
+        rng = np.random.default_rng(0)
+        normals = rng.normal(size=(3 * NORMAL_BLOCK_ROWS + 5, 3)).astype(np.float32)
+        normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+        indices = self.converter.find_closest_normals_batch(normals)
+        
+        scores = normals @ ANORMS_NP.T
+        chosen = scores[np.arange(len(normals)), indices]
+        np.testing.assert_allclose(chosen, scores.max(axis=1), atol=1e-6)
+    
+    @unittest.skipUnless(NUMPY_AVAILABLE, "numpy not available")
+    def test_transform_mesh_non_uniform_scale(self):
+        """Test world transform scales positions and re-normalizes inverse-transpose normals"""
+        import numpy as np
+        from fbx_to_mdl_converter import _transform_mesh
+        
+        matrix = np.diag([2.0, 1.0, 0.5, 1.0])
+        matrix[:3, 3] = (1.0, -2.0, 3.0)
+        coords = np.array([[1.0, 1.0, 1.0], [0.0, 0.0, 0.0]])
+        normals = np.array([[1.0, 1.0, 0.0], [0.0, 0.0, 1.0]]) / np.array([[np.sqrt(2.0)], [1.0]])
+        
+        world_coords, world_normals = _transform_mesh(coords, normals, matrix)
+        np.testing.assert_allclose(world_coords, [[3.0, -1.0, 3.5], [1.0, -2.0, 3.0]])
+        # Normals scale by the inverse: (1, 1, 0) -> (0.5, 1, 0), then unit length
+        np.testing.assert_allclose(world_normals, [[1 / np.sqrt(5.0), 2 / np.sqrt(5.0), 0.0],
+                                                   [0.0, 0.0, 1.0]], atol=1e-12)
+        
+        # A zero-scale axis flattens the mesh without producing NaNs
+        flat = np.diag([1.0, 1.0, 0.0, 1.0])
+        world_coords, world_normals = _transform_mesh(coords, normals, flat)
+        np.testing.assert_allclose(world_coords[:, 2], 0.0)
+        self.assertFalse(np.isnan(world_normals).any())
+        np.testing.assert_allclose(np.linalg.norm(world_normals[0]), 1.0)
+    
+    @unittest.skipUnless(NUMPY_AVAILABLE, "numpy not available")
+    def test_merge_duplicate_vertices(self):
+        """Test identical vertices merge while split normals on a hard edge stay separate"""
+        import numpy as np
+        from fbx_to_mdl_converter import _merge_duplicate_vertices
+        
+        coords = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0],
+                           [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [1.0, 0.0, 0.0]])
+        normals = np.array([[0.0, 0.0, 1.0], [0.0, 0.0, 1.0], [0.0, 0.0, 1.0],
+                            [0.0, 0.0, 1.0], [0.0, 0.0, 1.0], [1.0, 0.0, 0.0]])
+        faces = np.array([[0, 1, 2], [3, 4, 5]])
+        
+        merged_coords, merged_normals, merged_faces = _merge_duplicate_vertices(coords, normals, faces)
+        self.assertEqual(len(merged_coords), 4)  # Vertex 5 shares a position but not a normal
+        self.assertEqual(merged_faces.shape, faces.shape)
+        np.testing.assert_array_equal(merged_coords[merged_faces], coords[faces])
+        np.testing.assert_array_equal(merged_normals[merged_faces], normals[faces])
+        self.assertEqual(merged_faces[1, 0], merged_faces[0, 1])
+        self.assertEqual(merged_faces[1, 1], merged_faces[0, 2])
+        self.assertNotEqual(merged_faces[1, 2], merged_faces[0, 1])
+    
+    @unittest.skipUnless(NUMPY_AVAILABLE, "numpy not available")
+    def test_compress_vertices(self):
+        """Test batched vertex compression matches compress_vertex"""
+        bounds_min = (-10.0, -5.0, 0.0)
+        bounds_max = (10.0, 5.0, 0.0)  # Zero range on the z axis
+        vertices = [(0.0, 0.0, 0.0), (-10.0, -5.0, 0.0), (10.0, 5.0, 0.0),
+                    (3.3, -1.7, 0.0), (20.0, -20.0, 0.0)]
+        
+        compressed = self.converter.compress_vertices(vertices, bounds_min, bounds_max)
+        
+        self.assertEqual(compressed.shape, (len(vertices), 3))
+        expected = [list(self.converter.compress_vertex(v, bounds_min, bounds_max)) for v in vertices]
+        self.assertEqual(compressed.tolist(), expected)
+    
     def test_write_mdl_file_empty(self):
         """Test writing empty MDL file"""
         output_path = os.path.join(self.temp_dir, "test_empty.mdl")
@@ -175,6 +293,74 @@ class TestFBXToMDLConverter(unittest.TestCase):
         file_size = os.path.getsize(output_path)
         self.assertGreater(file_size, 100)  # Should have substantial content
     
+    @unittest.skipUnless(NUMPY_AVAILABLE, "numpy not available")
+    def test_write_mdl_file_packed_arrays(self):
+        """Test packed vertex/triangle arrays write the same bytes as the dataclass lists"""
+        import numpy as np
+        
+        list_path = os.path.join(self.temp_dir, "test_lists.mdl")
+        packed_path = os.path.join(self.temp_dir, "test_packed.mdl")
+        
+        self.converter.model_name = "test_model"
+        for i in range(4):
+            self.converter.vertices.append(MDLVertex(x=i*60, y=255-i, z=i, normal_index=i*40))
+        self.converter.triangles.append(MDLTriangle(face_front=True, vertex_indices=[0, 1, 2]))
+        self.converter.triangles.append(MDLTriangle(face_front=False, vertex_indices=[2, 3, 0]))
+        self.assertTrue(self.converter.write_mdl_file(list_path))
+        
+        packed = FBXToMDLConverter()
+        packed.model_name = "test_model"
+        packed.vertices_xyz = np.array([[v.x, v.y, v.z] for v in self.converter.vertices], dtype=np.uint8)
+        packed.vertex_normals = np.array([v.normal_index for v in self.converter.vertices], dtype=np.uint8)
+        packed.tri_indices = np.array([[0, 1, 2], [2, 3, 0]], dtype=np.uint32)
+        packed.tri_front = np.array([1, 0], dtype=np.uint8)
+        self.assertEqual(packed.vertex_count, 4)
+        self.assertEqual(packed.triangle_count, 2)
+        self.assertTrue(packed.write_mdl_file(packed_path))
+        
+        with open(list_path, 'rb') as f1, open(packed_path, 'rb') as f2:
+            self.assertEqual(f1.read(), f2.read())
+    
+    @unittest.skipUnless(NUMPY_AVAILABLE, "numpy not available")
+    def test_optimize_mesh_layout(self):
+        """Test vertex cache optimisation keeps the mesh and lowers cache misses"""
+        import numpy as np
+        from collections import deque
+        
+        def cache_misses(tri_indices, cache_size=16):
+            cache = deque(maxlen=cache_size)
+            misses = 0
+            for v in np.asarray(tri_indices).ravel().tolist():
+                if v not in cache:
+                    misses += 1
+                    cache.append(v)
+            return misses
+        
+        # 8x8 quad grid with shuffled triangles
+        grid = np.arange(81).reshape(9, 9)
+        quads = np.stack([grid[:-1, :-1], grid[:-1, 1:], grid[1:, :-1], grid[1:, 1:]], axis=-1).reshape(-1, 4)
+        tris = np.concatenate([quads[:, [0, 1, 2]], quads[:, [1, 3, 2]]])
+        tris = tris[np.random.default_rng(0).permutation(len(tris))].astype(np.uint32)
+        
+        self.converter.vertices_xyz = np.stack([np.arange(81) % 9, np.arange(81) // 9,
+                                                np.zeros(81)], axis=1).astype(np.uint8)
+        self.converter.vertex_normals = np.arange(81, dtype=np.uint8)
+        self.converter.tri_indices = tris
+        self.converter.tri_front = np.ones(len(tris), dtype=np.uint8)
+        
+        def triangle_set(converter):
+            payload = np.concatenate([converter.vertices_xyz, converter.vertex_normals[:, None]], axis=1)
+            return sorted(tuple(map(tuple, payload[tri].tolist())) for tri in converter.tri_indices)
+        
+        before = triangle_set(self.converter)
+        misses_before = cache_misses(self.converter.tri_indices)
+        self.converter.optimize_mesh_layout()
+        
+        self.assertEqual(triangle_set(self.converter), before)
+        self.assertLess(cache_misses(self.converter.tri_indices), misses_before)
+        # Vertices are laid out in first-use order
+        self.assertEqual(self.converter.tri_indices[0].tolist(), [0, 1, 2])
+    
     def test_generate_qc_file(self):
         """Test QC file generation"""
         mdl_path = os.path.join(self.temp_dir, "test.mdl")
@@ -253,6 +439,28 @@ class TestFBXToMDLConverter(unittest.TestCase):
             self.assertEqual(data["triangle_count"], 1)
             self.assertIn("vertices", data)
             self.assertIn("triangles", data)
+    
+    def test_export_preview_json_stdlib_fallback(self):
+        """Test the stdlib json fallback writes the same data as the default serializer"""
+        import fbx_to_mdl_converter
+        
+        self.converter.model_name = "test_model"
+        self.converter.bounds_min = [-1e-05, -1.0, -1.0]
+        self.converter.bounds_max = [1e16, 1.0, 1.0]
+        self.converter.vertices.append(MDLVertex(x=128, y=128, z=128, normal_index=0))
+        self.converter.triangles.append(MDLTriangle(face_front=True, vertex_indices=[0, 0, 0]))
+        
+        default_path = os.path.join(self.temp_dir, "default.json")
+        self.assertTrue(self.converter.export_preview_json(default_path))
+        with mock.patch.object(fbx_to_mdl_converter, "ORJSON_AVAILABLE", False):
+            for pretty in (False, True):
+                json_path = os.path.join(self.temp_dir, f"stdlib_{pretty}.json")
+                self.assertTrue(self.converter.export_preview_json(json_path, pretty=pretty))
+                with open(json_path, 'r') as f:
+                    text = f.read()
+                self.assertEqual("\n" in text, pretty)
+                with open(default_path, 'r') as f:
+                    self.assertEqual(json.loads(text), json.load(f))
 
 class TestMDLConstants(unittest.TestCase):
     """Test MDL format constants and anorms"""
@@ -273,6 +481,26 @@ class TestMDLConstants(unittest.TestCase):
             self.assertAlmostEqual(length_sq, 1.0, places=5, 
                                  msg=f"Anorm {i} is not normalized: {anorm}")
     
+    def test_octant_candidates_contain_best_anorm(self):
+        """Test the octant pruning table never drops the best-scoring anorm"""
+        from fbx_to_mdl_converter import _OCTANT_CANDIDATES
+        import random
+        
+        import fbx_to_mdl_converter
+        
+        rng = random.Random(0)
+        test_vectors = list(MDL_ANORMS) + [tuple(rng.gauss(0, 1) for _ in range(3)) for _ in range(5000)]
+        converter = FBXToMDLConverter()
+        with mock.patch.object(fbx_to_mdl_converter, "NUMPY_AVAILABLE", False):
+            for vec in test_vectors + [(0.0, 0.0, 0.0)]:
+                dots = [vec[0] * a[0] + vec[1] * a[1] + vec[2] * a[2] for a in MDL_ANORMS]
+                best = dots.index(max(dots))
+                self.assertEqual(converter.find_closest_normal(vec), best, f"Pruned scan differs for {vec}")
+                if any(vec):
+                    octant = (vec[0] >= 0) << 2 | (vec[1] >= 0) << 1 | (vec[2] >= 0)
+                    candidates = [c[0] for c in _OCTANT_CANDIDATES[octant]]
+                    self.assertIn(best, candidates, f"Anorm {best} missing from octant {octant} for {vec}")
+    
     def test_mdl_anorms_coverage(self):
         """Test that anorms provide good coverage of unit sphere"""
         # Test some key directions are represented
@@ -341,6 +569,342 @@ class TestErrorHandling(unittest.TestCase):
         except ZeroDivisionError:
             self.fail("Vertex compression should handle zero bounds gracefully")
 
+class TestMDLValidator(unittest.TestCase):
+    """Test the MDL validator against converter output"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.converter = FBXToMDLConverter()
+        self.converter.model_name = "test_model"
+        self.converter.bounds_min = [-1.0, -1.0, -1.0]
+        self.converter.bounds_max = [1.0, 1.0, 1.0]
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_validate_vertices(self):
+        """Test out-of-range normal indices are reported"""
+        from mdl_validator import MDLValidator
+
+        output_path = os.path.join(self.temp_dir, "test_vertices.mdl")
+        for i, normal_index in enumerate([0, 161, 200]):
+            self.converter.vertices.append(MDLVertex(x=i, y=i, z=i, normal_index=normal_index))
+        self.converter.triangles.append(MDLTriangle(face_front=True, vertex_indices=[0, 1, 2]))
+        self.assertTrue(self.converter.write_mdl_file(output_path))
+
+        result = MDLValidator().validate_file(output_path)
+        self.assertTrue(result.valid)
+        self.assertEqual(result.info["vertex_count"], 3)
+        self.assertIn("1 vertices have invalid data", result.warnings)
+
+    def test_validate_textures(self):
+        """Test texture names are decoded and bad dimensions are counted"""
+        from mdl_validator import MDLValidator
+
+        output_path = os.path.join(self.temp_dir, "test_textures.mdl")
+        for i, (width, height) in enumerate([(256, 256), (100, 64), (1024, 16)]):
+            self.converter.textures.append(MDLTexture(name=f"tex{i}.bmp", flags=0,
+                                                      width=width, height=height, index=i))
+        self.assertTrue(self.converter.write_mdl_file(output_path))
+
+        result = MDLValidator().validate_file(output_path)
+        self.assertEqual(result.info["texture_names"], ["tex0.bmp", "tex1.bmp", "tex2.bmp"])
+        self.assertIn("2 textures have invalid dimensions", result.warnings)
+
+    def test_validate_sequences(self):
+        """Test bad sequence fps and frame counts are counted"""
+        from mdl_validator import MDLValidator
+
+        output_path = os.path.join(self.temp_dir, "test_sequences.mdl")
+        header = struct.pack('<4sI64sI6f5I', MDL_MAGIC, MDL_VERSION, b"test_model", 10,
+                             -1.0, -1.0, -1.0, 1.0, 1.0, 1.0, 0, 0, 0, 3, 0)
+        sequences = bytearray(3 * 176)  # validator's 176-byte sequence records
+        for i, (name, fps, numframes) in enumerate([(b"idle", 30.0, 10), (b"run", 0.0, 10), (b"jump", 200.0, 0)]):
+            struct.pack_into('<32sf', sequences, i * 176, name, fps)
+            struct.pack_into('<I', sequences, i * 176 + 60, numframes)
+        with open(output_path, 'wb') as f:
+            f.write(header + bytes(sequences))
+
+        result = MDLValidator().validate_file(output_path)
+        self.assertEqual(result.info["sequence_names"], ["idle", "run", "jump"])
+        self.assertIn("3 sequences have invalid parameters", result.warnings)
+
+    def _write_bones(self, output_path, names, parents):
+        """Write a header plus the validator's 56-byte bone records"""
+        header = struct.pack('<4sI64sI6f5I', MDL_MAGIC, MDL_VERSION, b"test_model", 10,
+                             -1.0, -1.0, -1.0, 1.0, 1.0, 1.0, 0, 0, len(names), 0, 0)
+        bones = bytearray(len(names) * 56)
+        for i, (name, parent) in enumerate(zip(names, parents)):
+            struct.pack_into('<32s', bones, i * 56, name)
+            struct.pack_into('<i', bones, i * 56 + 32, parent)
+        with open(output_path, 'wb') as f:
+            f.write(header + bytes(bones))
+
+    def test_validate_bones(self):
+        """Test bad parent references and duplicate bone names are reported"""
+        from mdl_validator import MDLValidator
+
+        output_path = os.path.join(self.temp_dir, "test_bones.mdl")
+        # pelvis -> self-reference, spine -> forward reference, head -> out of range (counted twice)
+        self._write_bones(output_path, [b"root", b"pelvis", b"spine", b"head", b"head"],
+                          [-1, 1, 4, 9, 0])
+
+        result = MDLValidator().validate_file(output_path)
+        self.assertEqual(result.info["bone_names"], ["root", "pelvis", "spine", "head", "head"])
+        self.assertIn("4 bones have invalid parent references", result.warnings)
+        self.assertIn("Duplicate bone names detected", result.warnings)
+
+    def test_validate_corrupt_counts(self):
+        """Test an implausible count stops validation before the sections"""
+        from mdl_validator import MDLValidator
+
+        output_path = os.path.join(self.temp_dir, "test_corrupt.mdl")
+        header = struct.pack('<4sI64sI6f5I', MDL_MAGIC, MDL_VERSION, b"test_model", 10,
+                             -1.0, -1.0, -1.0, 1.0, 1.0, 1.0, 2**31, 0, 0, 0, 0)
+        with open(output_path, 'wb') as f:
+            f.write(header + bytes(64))
+
+        result = MDLValidator().validate_file(output_path)
+        self.assertFalse(result.valid)
+        self.assertIn("Implausible vertex count", result.errors[-1])
+        self.assertNotIn("vertices_validated", result.info)
+
+    def test_validation_results_are_independent(self):
+        """Test a result is not changed by the validator's next run"""
+        from mdl_validator import MDLValidator
+
+        validator = MDLValidator()
+        missing = validator.validate_file(os.path.join(self.temp_dir, "missing.mdl"))
+        self.assertFalse(missing.valid)
+        self.assertEqual(len(missing.errors), 1)
+
+        output_path = os.path.join(self.temp_dir, "test_empty.mdl")
+        self.assertTrue(self.converter.write_mdl_file(output_path))
+        validator.validate_file(output_path)
+        self.assertEqual(len(missing.errors), 1)
+        self.assertNotIn("vertex_count", missing.info)
+
+    def test_validate_many(self):
+        """Test batch validation returns one result per file, in order"""
+        from mdl_validator import validate_many
+
+        output_path = os.path.join(self.temp_dir, "test_empty.mdl")
+        self.assertTrue(self.converter.write_mdl_file(output_path))
+        missing_path = os.path.join(self.temp_dir, "missing.mdl")
+
+        results = validate_many([output_path, missing_path, output_path], max_workers=2)
+        self.assertEqual([result.valid for result in results], [True, False, True])
+        self.assertEqual(results[0].info["model_name"], "test_model")
+
+@unittest.skipUnless(PIL_AVAILABLE, "PIL not available")
+class TestTextureProcessor(unittest.TestCase):
+    """Test texture conversion for the MDL format"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.processor = TextureProcessor()
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_next_power_of_two(self):
+        """Test rounding up to a power of two, including sizes beyond float precision"""
+        self.assertEqual([self.processor.next_power_of_two(n) for n in (-1, 0, 1, 2, 3, 255, 256, 257)],
+                         [1, 1, 1, 2, 4, 256, 256, 512])
+        self.assertEqual(self.processor.next_power_of_two(2 ** 53 + 1), 2 ** 54)
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "numpy not available")
+    def test_quantize_method_auto(self):
+        """Test auto quantization uses median cut for small images and octree for large ones"""
+        import numpy as np
+        from PIL import Image
+
+        rng = np.random.default_rng(0)
+        small = Image.fromarray(rng.integers(0, 256, (64, 64, 3), dtype=np.uint8))
+        large = Image.fromarray(rng.integers(0, 256, (512, 512, 3), dtype=np.uint8))
+        median = TextureProcessor(quantize_method='median')
+        octree = TextureProcessor(quantize_method='fastoctree')
+
+        self.assertEqual(self.processor.quantize_image(small).tobytes(), median.quantize_image(small).tobytes())
+        self.assertEqual(self.processor.quantize_image(large).tobytes(), octree.quantize_image(large).tobytes())
+        with self.assertRaises(ValueError):
+            TextureProcessor(quantize_method='kmeans')
+
+    def test_collect_textures(self):
+        """Test existing textures are found in input order, both listed and stat-checked"""
+        paths = []
+        for i in range(10):
+            path = os.path.join(self.temp_dir, f'skin{i}.bmp')
+            open(path, 'wb').close()
+            paths.append(path)
+        missing = os.path.join(self.temp_dir, 'missing.bmp')
+
+        self.assertEqual(_collect_textures([missing] + paths[::-1]), paths[::-1])
+        self.assertEqual(_collect_textures([paths[3], missing]), [paths[3]])
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "numpy not available")
+    def test_create_texture_atlas(self):
+        """Test atlas tiles and UV rects match the PIL paste path for mixed sizes and modes"""
+        from PIL import Image
+        import texture_processor
+
+        sources = [
+            ('rgba.png', Image.new('RGBA', (40, 20), (255, 0, 0, 128))),
+            ('indexed.png', Image.new('RGB', (16, 16), (0, 200, 0)).quantize(8)),
+            ('rgb.bmp', Image.new('RGB', (64, 64), (0, 0, 255))),
+        ]
+        texture_paths = []
+        for name, image in sources:
+            path = os.path.join(self.temp_dir, name)
+            image.save(path)
+            texture_paths.append(path)
+        # A missing texture leaves its cell empty
+        texture_paths.insert(2, os.path.join(self.temp_dir, 'missing.png'))
+
+        atlas_path = os.path.join(self.temp_dir, 'atlas.bmp')
+        paste_path = os.path.join(self.temp_dir, 'atlas_paste.bmp')
+        result = self.processor.create_texture_atlas(texture_paths, atlas_path, (128, 128))
+        with mock.patch.object(texture_processor, 'NUMPY_AVAILABLE', False):
+            paste_result = self.processor.create_texture_atlas(texture_paths, paste_path, (128, 128))
+
+        self.assertEqual(result['grid_size'], 2)
+        self.assertEqual(result['cell_size'], (64, 64))
+        self.assertEqual([t['atlas_position'] for t in result['textures']], [(0, 0), (64, 0), (64, 64)])
+        self.assertEqual([t['uv_coords'] for t in result['textures']],
+                         [(0.0, 0.0, 0.5, 0.5), (0.5, 0.0, 1.0, 0.5), (0.5, 0.5, 1.0, 1.0)])
+        self.assertEqual({k: v for k, v in result.items() if k != 'atlas_path'},
+                         {k: v for k, v in paste_result.items() if k != 'atlas_path'})
+
+        with Image.open(atlas_path) as atlas, Image.open(paste_path) as pasted:
+            self.assertEqual(atlas.convert('RGB').tobytes(), pasted.convert('RGB').tobytes())
+            rgb = atlas.convert('RGB')
+            self.assertEqual(rgb.getpixel((10, 10)), (255, 0, 0))
+            self.assertEqual(rgb.getpixel((100, 10)), (0, 200, 0))
+            self.assertEqual(rgb.getpixel((10, 100)), (0, 0, 0))
+            self.assertEqual(rgb.getpixel((100, 100)), (0, 0, 255))
+
+    def test_create_bmp_palette(self):
+        """Test palette entries are reordered to BGR plus a reserved byte"""
+        from PIL import Image
+
+        image = Image.new('P', (16, 16))
+        image.putpalette([10, 20, 30, 40, 50, 60])
+        bmp_palette = self.processor.create_bmp_palette(image)
+
+        self.assertEqual(len(bmp_palette), 1024)
+        self.assertEqual(bmp_palette[:8], bytes([30, 20, 10, 0, 60, 50, 40, 0]))
+
+    def test_process_texture_file_cache(self):
+        """Test an unchanged texture is not reprocessed"""
+        from PIL import Image
+
+        input_path = os.path.join(self.temp_dir, 'skin.png')
+        Image.new('RGB', (64, 64), (200, 100, 50)).save(input_path)
+        output_dir = os.path.join(self.temp_dir, 'out')
+
+        first = self.processor.process_texture_file(input_path, output_dir)
+        self.assertIsNotNone(first)
+        with mock.patch('texture_processor.Image.open') as mock_open:
+            second = self.processor.process_texture_file(input_path, output_dir)
+        mock_open.assert_not_called()
+        self.assertEqual(first, second)
+
+        os.remove(first['output_path'])
+        third = self.processor.process_texture_file(input_path, output_dir)
+        self.assertTrue(os.path.exists(third['output_path']))
+
+    def test_process_texture_file_cache_invalidation(self):
+        """Test a cached result is not reused after its output or the quantizer settings change"""
+        from PIL import Image
+
+        png_path = os.path.join(self.temp_dir, 'skin.png')
+        tga_path = os.path.join(self.temp_dir, 'skin.tga')
+        Image.new('RGB', (64, 64), (200, 100, 50)).save(png_path)
+        Image.new('RGB', (64, 64), (10, 20, 30)).save(tga_path)
+        output_dir = os.path.join(self.temp_dir, 'out')
+
+        # Both inputs write skin_indexed.bmp; the third call must rewrite the PNG's pixels
+        first = self.processor.process_texture_file(png_path, output_dir)
+        self.processor.process_texture_file(tga_path, output_dir)
+        with mock.patch('texture_processor.Image.open', wraps=Image.open) as mock_open:
+            third = self.processor.process_texture_file(png_path, output_dir)
+        mock_open.assert_called_once()
+        self.assertEqual(first, third)
+        with Image.open(third['output_path']) as image:
+            self.assertEqual(image.convert('RGB').getpixel((0, 0)), (200, 100, 50))
+
+        self.processor.max_colors = 16
+        with mock.patch('texture_processor.Image.open', wraps=Image.open) as mock_open:
+            self.processor.process_texture_file(png_path, output_dir)
+        mock_open.assert_called_once()
+
+        self.processor.quantize_method = 'fastoctree'
+        with mock.patch('texture_processor.Image.open', wraps=Image.open) as mock_open:
+            self.processor.process_texture_file(png_path, output_dir)
+        mock_open.assert_called_once()
+
+    def test_batch_process_textures_parallel_same_stem(self):
+        """Test inputs sharing an output BMP stay out of the pool and the last one wins"""
+        from concurrent.futures import ProcessPoolExecutor
+        from PIL import Image
+        import texture_processor
+
+        input_paths = []
+        for i in range(texture_processor.PARALLEL_TEXTURE_THRESHOLD):
+            input_path = os.path.join(self.temp_dir, f'skin{i}.png')
+            Image.new('RGB', (32, 32), (i * 30, 100, 50)).save(input_path)
+            input_paths.append(input_path)
+        for sub, size, color in (('a', 64, (250, 0, 0)), ('b', 16, (0, 0, 250))):
+            os.makedirs(os.path.join(self.temp_dir, sub))
+            input_path = os.path.join(self.temp_dir, sub, 'skin.png' if sub == 'a' else 'skin.tga')
+            Image.new('RGB', (size, size), color).save(input_path)
+            input_paths.append(input_path)
+        output_dir = os.path.join(self.temp_dir, 'out')
+
+        dispatched = []
+        real_map = ProcessPoolExecutor.map
+        def spy_map(pool, fn, processors, paths, *iterables, **kwargs):
+            paths = list(paths)
+            dispatched.extend(paths)
+            return real_map(pool, fn, processors, paths, *iterables, **kwargs)
+
+        with mock.patch.object(ProcessPoolExecutor, 'map', spy_map):
+            results = TextureProcessor(max_workers=2).batch_process_textures(input_paths, output_dir)
+
+        self.assertEqual(sorted(dispatched), sorted(input_paths[:-2]))
+        self.assertEqual([r['input_path'] for r in results], input_paths)
+        with Image.open(os.path.join(output_dir, 'skin_indexed.bmp')) as image:
+            self.assertEqual(image.size, (16, 16))
+            self.assertEqual(image.convert('RGB').getpixel((0, 0)), (0, 0, 250))
+
+    def test_batch_process_textures_parallel(self):
+        """Test a parallel batch matches processing each texture in turn"""
+        from PIL import Image
+
+        input_paths = []
+        for i in range(8):
+            input_path = os.path.join(self.temp_dir, f'skin{i}.png')
+            Image.new('RGB', (32, 32), (i * 30, 100, 50)).save(input_path)
+            input_paths.append(input_path)
+        missing_path = os.path.join(self.temp_dir, 'missing.png')
+
+        parallel = TextureProcessor(max_workers=2).batch_process_textures(
+            input_paths + [missing_path], os.path.join(self.temp_dir, 'par'))
+        serial = [TextureProcessor().process_texture_file(path, os.path.join(self.temp_dir, 'ser'))
+                  for path in input_paths]
+
+        self.assertEqual(len(parallel), 8)
+        for par, ser in zip(parallel, serial):
+            self.assertEqual(os.path.basename(par['output_path']), os.path.basename(ser['output_path']))
+            with open(par['output_path'], 'rb') as f1, open(ser['output_path'], 'rb') as f2:
+                self.assertEqual(f1.read(), f2.read())
+
 class TestCLIIntegration(unittest.TestCase):
     """Test command-line interface integration"""
     